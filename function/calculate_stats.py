@@ -1,20 +1,26 @@
 #!/usr/bin/env python3
 
-import json
 import argparse
+import heapq
 import os
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+
+import numpy as np
+
+from json_utils import iter_json_items, save_json
 
 # Ensure data directory exists
 DATA_DIR = 'data'
 os.makedirs(DATA_DIR, exist_ok=True)
 
-def verify_frequency_stats(stats):
+def verify_frequency_stats(stats, fail_fast=True):
     """
     Verify that frequency statistics are consistent
     
     Args:
         stats (dict): Statistics object to verify
+        fail_fast (bool): Stop at the first failed check instead of reporting every failure
     
     Returns:
         bool: True if verification passes
@@ -22,32 +28,44 @@ def verify_frequency_stats(stats):
     # Get the residuals for regular numbers by position
     position_residuals = stats['byPosition']
     
+    # Sum each position's frequencies once; the first position's total is the expected draw count
+    position_sums = {
+        pos_key: sum(res['observed'] for res in residuals.values())
+        for pos_key, residuals in position_residuals.items()
+    }
+    
     # Calculate total draws from the first position's frequency
-    first_position = list(position_residuals.keys())[0]  # Get first position key
-    total_draws = sum(res['observed'] for res in position_residuals[first_position].values())
+    total_draws = next(iter(position_sums.values()))
+    passed = True
     
     # Verify each position has the correct number of draws
-    for pos_key in position_residuals.keys():
-        pos_sum = sum(res['observed'] for res in position_residuals[pos_key].values())
+    for pos_key, pos_sum in position_sums.items():
         if pos_sum != total_draws:
             print(f"  Position {pos_key}: Frequency sum check failed (got {pos_sum}, expected {total_draws})")
-            return False
-        print(f"  Position {pos_key}: Frequency sum check passed ({pos_sum})")
+            if fail_fast:
+                return False
+            passed = False
+        else:
+            print(f"  Position {pos_key}: Frequency sum check passed ({pos_sum})")
     
     # Verify special ball frequencies
     special_residuals = stats['specialBallNumbers']
     special_sum = sum(res['observed'] for res in special_residuals.values())
     if special_sum != total_draws:
         print(f"  Special ball validation: Failed (sum={special_sum}, expected={total_draws})")
-        return False
-    print(f"  Special ball validation: Passed (sum={special_sum}, expected={total_draws})")
+        if fail_fast:
+            return False
+        passed = False
+    else:
+        print(f"  Special ball validation: Passed (sum={special_sum}, expected={total_draws})")
     
-    return True
+    return passed
 
 def calculate_lottery_stats(mm_input="data/mm.json", 
                            pb_input="data/pb.json",
                            mm_output="data/mm-stats.json", 
-                           pb_output="data/pb-stats.json"):
+                           pb_output="data/pb-stats.json",
+                           pretty=False):
     """
     Calculate comprehensive statistics for lottery draws
     
@@ -56,22 +74,19 @@ def calculate_lottery_stats(mm_input="data/mm.json",
         pb_input (str): Path to the Powerball draws JSON file
         mm_output (str): Path to save Mega Millions statistics
         pb_output (str): Path to save Powerball statistics
+        pretty (bool): Write indented JSON instead of compact JSON
         
     Returns:
         tuple: (mm_stats, pb_stats) - The calculated statistics for both lottery types
     """
     try:
-        # Read the Mega Millions file
+        # Iterate over the Mega Millions draws (only very large files are streamed)
         print(f"Reading Mega Millions draws from {mm_input}...")
-        with open(mm_input, 'r') as f:
-            mm_draws = json.load(f)
+        mm_draws = iter_json_items(mm_input)
         
-        # Read the Powerball file
+        # Iterate over the Powerball draws
         print(f"Reading Powerball draws from {pb_input}...")
-        with open(pb_input, 'r') as f:
-            pb_draws = json.load(f)
-        
-        print(f"Found {len(mm_draws)} Mega Millions draws and {len(pb_draws)} Powerball draws")
+        pb_draws = iter_json_items(pb_input)
         
         # Calculate statistics for Mega Millions
         mm_stats = calculate_stats_for_type(mm_draws, "mega-millions", 
@@ -91,14 +106,16 @@ def calculate_lottery_stats(mm_input="data/mm.json",
         else:
             print("\nWARNING: Some frequency statistics verification failed. Check the logs above.")
         
-        # Save the statistics to separate files
-        with open(mm_output, 'w') as f:
-            json.dump(mm_stats, f, indent=2)
-        print(f"Saved Mega Millions statistics to {mm_output}")
-        
-        with open(pb_output, 'w') as f:
-            json.dump(pb_stats, f, indent=2)
-        print(f"Saved Powerball statistics to {pb_output}")
+        # Save the statistics to separate files concurrently; the writes release the GIL
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            mm_saved = executor.submit(save_json, mm_stats, mm_output, pretty=pretty)
+            pb_saved = executor.submit(save_json, pb_stats, pb_output, pretty=pretty)
+            
+            mm_saved.result()
+            print(f"Saved Mega Millions statistics to {mm_output}")
+            
+            pb_saved.result()
+            print(f"Saved Powerball statistics to {pb_output}")
         
         return mm_stats, pb_stats
         
@@ -118,37 +135,27 @@ def sort_frequency_dict(freq_dict):
     Returns:
         dict: Sorted dictionary with most frequent numbers first
     """
-    # Convert to list of tuples, sort by frequency (descending)
-    sorted_items = sorted(freq_dict.items(), key=lambda x: int(x[1]), reverse=True)
-    
-    # Convert back to dictionary (maintaining order in Python 3.7+)
-    return {k: v for k, v in sorted_items}
+    # Sort by frequency (descending) and convert back to a dictionary (maintaining order in Python 3.7+)
+    return dict(sorted(freq_dict.items(), key=itemgetter(1), reverse=True))
 
 def find_optimized_numbers(frequency_dict, special_frequency):
     """
     Find optimized winning numbers based on frequency data
     
     Args:
-        frequency_dict (dict): Dictionary of number frequencies
-        special_frequency (dict): Dictionary of special ball frequencies
+        frequency_dict (dict): Dictionary of number (int) -> frequency
+        special_frequency (dict): Dictionary of special ball (int) -> frequency
     
     Returns:
         list: List of optimized numbers [5 regular numbers + 1 special ball]
     """
-    # Sort regular numbers by frequency
-    sorted_regular = sorted(frequency_dict.items(), 
-                          key=lambda x: x[1], 
-                          reverse=True)
-    
-    # Get top 5 regular numbers
-    optimized_regular = [int(num) for num, _ in sorted_regular[:5]]
+    # Get top 5 regular numbers (no need to sort the whole frequency list)
+    top_regular = heapq.nlargest(5, frequency_dict.items(), key=itemgetter(1))
+    optimized_regular = [num for num, _ in top_regular]
     optimized_regular.sort()  # Sort in ascending order
     
-    # Get most frequent special ball
-    sorted_special = sorted(special_frequency.items(), 
-                          key=lambda x: x[1], 
-                          reverse=True)
-    best_special_ball = int(sorted_special[0][0])
+    # Get most frequent special ball (1 if there are no special ball frequencies)
+    best_special_ball = max(special_frequency.items(), key=itemgetter(1), default=(1, 0))[0]
     
     return optimized_regular + [best_special_ball]
 
@@ -266,14 +273,15 @@ def calculate_standardized_residuals(frequency_dict, total_draws, max_number):
         max_number (int): Maximum possible number
     
     Returns:
-        dict: Dictionary of standardized residuals
+        dict: Dictionary of standardized residuals, keyed by number as a string
     """
     residuals = {}
     expected = total_draws / max_number
+    expected_sqrt = expected ** 0.5  # Same for every number, so compute it once
     
     for number, observed in frequency_dict.items():
-        residual = (observed - expected) / (expected ** 0.5)
-        residuals[number] = {
+        residual = (observed - expected) / expected_sqrt
+        residuals[str(number)] = {
             "observed": observed,
             "expected": expected,
             "residual": residual,
@@ -308,7 +316,7 @@ def calculate_position_specific_residuals(frequency_at_position, total_draws, k)
         residuals = {}
         for num, observed in pos_freq.items():
             # Calculate standardized residual
-            zi = (int(observed) - expected_frequency) / (expected_frequency ** 0.5)
+            zi = (observed - expected_frequency) / (expected_frequency ** 0.5)
             
             # Determine significance levels
             # 95% confidence (|z| > 1.96)
@@ -333,7 +341,7 @@ def calculate_stats_for_type(draws, lottery_type, max_regular, max_special):
     Calculate statistics for a specific lottery type
     
     Args:
-        draws (list): List of draw dictionaries
+        draws (iterable): Draw dictionaries (a list or a stream, consumed once)
         lottery_type (str): Type of lottery ("powerball" or "mega-millions")
         max_regular (int): Maximum regular number (69 for Powerball, 70 for Mega Millions)
         max_special (int): Maximum special ball number (26 for Powerball, 25 for Mega Millions)
@@ -341,60 +349,73 @@ def calculate_stats_for_type(draws, lottery_type, max_regular, max_special):
     Returns:
         dict: Calculated statistics
     """
-    # Initialize counters
-    valid_draws = 0
-    frequency = {str(i): 0 for i in range(1, max_regular + 1)}
-    special_frequency = {str(i): 0 for i in range(1, max_special + 1)}
-    position_frequency = {f"position{i}": {str(j): 0 for j in range(1, max_regular + 1)} for i in range(5)}
+    # Collect the valid draws as a flat list of 6 values per draw (5 regular numbers
+    # followed by the special ball) so they can be counted in a single vectorized pass
+    valid_values = []
+    total_draws = 0
+    
+    # Bind the append methods once rather than looking them up for every draw
+    add_numbers = valid_values.extend
+    add_special = valid_values.append
     
     # Process each draw
     for draw in draws:
-        if not isinstance(draw, dict):
+        total_draws += 1
+        
+        # Direct key access; anything that isn't a dict with both keys is skipped
+        try:
+            numbers = draw['numbers']
+            special_ball = draw['specialBall']
+        except (KeyError, TypeError):
             continue
-            
-        numbers = draw.get('numbers', [])
-        special_ball = draw.get('specialBall')
         
         # Skip if not a valid draw structure
         if not isinstance(numbers, list) or len(numbers) != 5 or not isinstance(special_ball, int):
             continue
         
-        # Validate all regular numbers are within range
-        valid_regular_numbers = True
+        # Only count draws whose numbers are all integers within range, checked before
+        # anything reaches the array so an out-of-range value can't overflow its dtype;
+        # the else branch runs only when no number failed the check
         for num in numbers:
             if not isinstance(num, int) or num < 1 or num > max_regular:
-                valid_regular_numbers = False
                 break
-        
-        # Validate special ball is within range
-        valid_special_ball = isinstance(special_ball, int) and 1 <= special_ball <= max_special
-        
-        # Only count if all numbers are valid
-        if valid_regular_numbers and valid_special_ball:
-            valid_draws += 1
-            
-            # Count regular numbers
-            for i, num in enumerate(numbers):
-                num_str = str(num)
-                frequency[num_str] += 1
-                position_frequency[f"position{i}"][num_str] += 1
-            
-            # Count special ball
-            special_frequency[str(special_ball)] += 1
-    
-    # Validate frequency counts
-    total_regular = sum(frequency.values())
-    total_special = sum(special_frequency.values())
-    
-    if total_regular != valid_draws * 5:
-        print(f"Warning: Total regular number frequency ({total_regular}) does not match expected ({valid_draws * 5})")
-    
-    if total_special != valid_draws:
-        print(f"Warning: Total special ball frequency ({total_special}) does not match expected ({valid_draws})")
+        else:
+            if 1 <= special_ball <= max_special:
+                add_numbers(numbers)
+                add_special(special_ball)
+    
+    valid_draws = len(valid_values) // 6
+    print(f"Found {total_draws} {lottery_type} draws ({valid_draws} valid)")
+    
+    # Load every valid draw into one contiguous (N, 6) array in a single allocation
+    draw_array = np.fromiter(valid_values, dtype=np.int16, count=valid_draws * 6).reshape(valid_draws, 6)
+    
+    nums = draw_array[:, :5]
+    specials = draw_array[:, 5]
+    
+    # Count regular numbers per position in a single pass by giving each position its
+    # own block of bins, then sum the positions for the overall counts
+    bins = max_regular + 1
+    position_offsets = np.arange(5, dtype=np.int32) * bins
+    position_counts = np.bincount((nums + position_offsets).ravel(), minlength=5 * bins).reshape(5, bins)
+    regular_counts = position_counts.sum(axis=0)
+    
+    # Count special balls
+    special_counts = np.bincount(specials, minlength=max_special + 1)
+    
+    # Build int-keyed frequency dictionaries; keys are only stringified when the
+    # residuals are built for the JSON output (index 0 is unused since numbers start at 1)
+    frequency = dict(enumerate(regular_counts.tolist()[1:], 1))
+    special_frequency = dict(enumerate(special_counts.tolist()[1:], 1))
+    position_frequency = {
+        f"position{i}": dict(enumerate(counts.tolist()[1:], 1))
+        for i, counts in enumerate(position_counts)
+    }
     
     # Calculate optimized numbers
+    # Both sets come from the same overall frequency ranking, so rank once and copy
     optimized_by_position = find_optimized_numbers(frequency, special_frequency)
-    optimized_by_general_frequency = find_optimized_numbers(frequency, special_frequency)
+    optimized_by_general_frequency = list(optimized_by_position)
     
     # Calculate standardized residuals
     regular_residuals = calculate_standardized_residuals(frequency, valid_draws * 5, max_regular)
@@ -424,6 +445,7 @@ if __name__ == "__main__":
     parser.add_argument("--pb-input", default="data/pb.json", help="Input JSON file with Powerball draws") 
     parser.add_argument("--mm-output", default="data/mm-stats.json", help="Output file for Mega Millions statistics")
     parser.add_argument("--pb-output", default="data/pb-stats.json", help="Output file for Powerball statistics")
+    parser.add_argument("--pretty", action="store_true", help="Write indented JSON for debugging")
     args = parser.parse_args()
     
-    calculate_lottery_stats(args.mm_input, args.pb_input, args.mm_output, args.pb_output)
\ No newline at end of file
+    calculate_lottery_stats(args.mm_input, args.pb_input, args.mm_output, args.pb_output, pretty=args.pretty)
\ No newline at end of file
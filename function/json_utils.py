@@ -0,0 +1,73 @@
+import json
+import os
+
+# orjson is considerably faster than the stdlib json module; fall back if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson parses JSON arrays incrementally so a whole draw history never has to be held in memory
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Files smaller than this are read in one go: ijson is several times slower than orjson per item,
+# and a draw history of a few thousand draws is only about 1 MB
+STREAM_MIN_BYTES = 64 * 1024 * 1024
+
+def load_json(path):
+    """
+    Load a JSON file, using orjson when available
+    
+    Args:
+        path (str): Path to the JSON file
+    
+    Returns:
+        The parsed JSON content
+    """
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def iter_json_items(path):
+    """
+    Iterate over the items of a JSON array file, streaming them with ijson when the file
+    is at least STREAM_MIN_BYTES and ijson is available
+    
+    Args:
+        path (str): Path to a JSON file containing an array
+    
+    Yields:
+        Each item of the array in order
+    """
+    if ijson is None or os.path.getsize(path) < STREAM_MIN_BYTES:
+        yield from load_json(path)
+        return
+    
+    with open(path, 'rb') as f:
+        yield from ijson.items(f, 'item')
+
+def save_json(data, path, pretty=False):
+    """
+    Save data to a JSON file, using orjson when available
+    
+    Args:
+        data: JSON-serializable data to save
+        path (str): Path to the output file
+        pretty (bool): Indent the output for readability instead of writing compact JSON
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0))
+        return
+    
+    with open(path, 'w') as f:
+        if pretty:
+            json.dump(data, f, indent=2)
+        else:
+            json.dump(data, f, separators=(',', ':'))
@@ -1,14 +1,35 @@
-import requests
-from bs4 import BeautifulSoup
+import urllib3
+from urllib3.util.retry import Retry
 from datetime import datetime
-import json
+from itertools import takewhile
+from concurrent.futures import ThreadPoolExecutor
+import atexit
+import logging
 import os
+import re
+import time
 from dotenv import load_dotenv
+from google.api_core.exceptions import NotFound
 from google.cloud import storage
+from json_utils import load_json, save_json
 
 # Load environment variables
 load_dotenv()
 
+# Progress goes to info, per-file and per-row detail to debug, so production runs can raise
+# the level and skip formatting and writing the noisy messages entirely
+logger = logging.getLogger(__name__)
+
+def configure_logging():
+    """
+    Send log messages to stderr at the level named by LOG_LEVEL (case-insensitive)
+    Falls back to INFO if LOG_LEVEL is unset or not a known level name
+    """
+    level = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').strip().upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+    logging.basicConfig(level=level, format='%(message)s')
+
 # Ensure data directory exists
 DATA_DIR = 'data'
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -16,48 +37,198 @@ os.makedirs(DATA_DIR, exist_ok=True)
 # GCS bucket name from environment variable or use default
 GCS_BUCKET = os.getenv('GCS_BUCKET', 'jackpot-iq')
 
+# Storage client and bucket, created on first use by get_bucket()
+_storage_client = None
+_bucket = None
+
+# Shared urllib3 pool manager so both scrapes reuse a pooled keep-alive connection to lottery.net,
+# retrying transient failures with backoff. Two plain GETs don't need the requests wrapper
+HTTP = urllib3.PoolManager(
+    num_pools=2,
+    maxsize=4,
+    headers={
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
+        'Accept': 'text/html',
+        # gzip and deflate, plus br when the brotli package is installed to decode it
+        'Accept-Encoding': urllib3.util.make_headers(accept_encoding=True)['accept-encoding']
+    },
+    retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+    # The connect timeout sits just above a multiple of 3s, the TCP retransmission window
+    timeout=urllib3.Timeout(connect=3.05, read=15)
+)
+atexit.register(HTTP.clear)
+
+# Precompiled patterns for extracting draws from a results page without building a DOM.
+# They match the raw response bytes, so the page is never decoded to str as a whole
+ROW_RE = re.compile(rb'<tr\b[^>]*>(.*?)</tr>', re.DOTALL | re.IGNORECASE)
+DATE_LINK_RE = re.compile(rb'<td\b[^>]*style="text-align: center;"[^>]*>.*?<a\b[^>]*>(.*?)</a>', re.DOTALL)
+TAG_RE = re.compile(rb'<[^>]+>')
+
+def _class_tag_pattern(tag, *classes):
+    """
+    Build the opening-tag pattern for an element whose class attribute contains every given class,
+    matched as whole tokens in any order (like the CSS selector tag.a.b), so extra classes don't break it
+    """
+    tokens = b''.join(rb'(?=(?:[^"]*\s)?' + re.escape(name.encode()) + rb'[\s"])' for name in classes)
+    return b'<' + tag.encode() + rb'\b[^>]*\bclass="' + tokens + rb'[^"]*"[^>]*>'
+
+BALL_RE = re.compile(_class_tag_pattern('li', 'ball') + rb'\s*(\d+)\s*</li>')
+
+# How long (seconds) get_latest_draws may reuse its last result while the draw files are unchanged.
+# A warm Cloud Functions instance keeps this across invocations
+LATEST_DRAWS_TTL = 3600
+_latest_draws_cache = {'timestamp': 0, 'mtimes': None, 'data': None}
+
+# Parsed draw files keyed by path, each stored with the (mtime, size) it was read at
+_draws_cache = {}
+
+# (mtime, size) of each data file when it was last downloaded from or uploaded to GCS;
+# a file that still matches is already in the bucket and doesn't need uploading again
+_synced_signatures = {}
+
+# CSS selectors for the selectolax fallback parser
+DRAW_ROW_SELECTOR = 'tr:has(td[style="text-align: center;"])'
+DATE_LINK_SELECTOR = 'td[style="text-align: center;"] a'
+BALL_SELECTOR = 'li.ball'
+
+# Per game: (main numbers list in the numbers cell, special ball) selectors
+GAME_SELECTORS = {
+    'powerball': ('td:nth-of-type(2) ul.multi.results.powerball', 'li.powerball'),
+    'megamillions': ('td:nth-of-type(2) ul.multi.results.mega-millions', 'li.mega-ball')
+}
+
+# Draw dates as printed on lottery.net ("Wednesday March 26, 2025"), parsed without strptime
+DATE_RE = re.compile(r'\w+\s+([A-Za-z]+)\s+(\d{1,2}),?\s+(\d{4})')
+MONTHS = {
+    'January': '01', 'February': '02', 'March': '03', 'April': '04',
+    'May': '05', 'June': '06', 'July': '07', 'August': '08',
+    'September': '09', 'October': '10', 'November': '11', 'December': '12'
+}
+
+# Per game: (main numbers list, special ball) patterns
+GAME_PATTERNS = {
+    'powerball': (
+        re.compile(_class_tag_pattern('ul', 'multi', 'results', 'powerball') + rb'(.*?)</ul>', re.DOTALL),
+        re.compile(_class_tag_pattern('li', 'powerball') + rb'\s*(\d+)')
+    ),
+    'megamillions': (
+        re.compile(_class_tag_pattern('ul', 'multi', 'results', 'mega-millions') + rb'(.*?)</ul>', re.DOTALL),
+        re.compile(_class_tag_pattern('li', 'mega-ball') + rb'\s*(\d+)')
+    )
+}
+
+def _file_signature(path):
+    """Return (mtime in ns, size) for a file, used to tell whether it changed"""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _read_sync_record(local_path):
+    """Return the (generation, signature) recorded when local_path was last synced, or None"""
+    record_path = f"{local_path}.gen"
+    if not os.path.exists(record_path):
+        return None
+    try:
+        record = load_json(record_path)
+        return (record['generation'], tuple(record['signature']))
+    except Exception:
+        return None
+
+def _write_sync_record(local_path, generation):
+    """Record the blob generation a local file matches, along with the file's current signature"""
+    signature = _file_signature(local_path)
+    _synced_signatures[os.path.basename(local_path)] = signature
+    if generation is not None:
+        save_json({'generation': generation, 'signature': list(signature)}, f"{local_path}.gen")
+
+def _download_one(bucket, filename):
+    """Download data/<filename> from the bucket, creating an empty local file if the blob is missing"""
+    local_path = os.path.join(DATA_DIR, filename)
+    blob = bucket.blob(f"data/{filename}")
+    
+    # A single metadata request both checks the blob exists and returns its current generation
+    try:
+        blob.reload()
+    except NotFound:
+        logger.info("File %s not found in GCS bucket. Will create it if needed.", filename)
+        # Create empty file if it doesn't exist locally
+        if not os.path.exists(local_path):
+            save_json([], local_path)
+            logger.info("Created empty %s", local_path)
+        return
+    
+    # Skip the download if the local copy is untouched since it last matched this generation
+    if os.path.exists(local_path) and _read_sync_record(local_path) == (blob.generation, _file_signature(local_path)):
+        _synced_signatures[filename] = _file_signature(local_path)
+        logger.debug("%s is up to date with GCS (generation %s). Skipping download.", filename, blob.generation)
+        return
+    
+    logger.debug("Downloading %s from GCS...", filename)
+    blob.download_to_filename(local_path, if_generation_match=blob.generation)
+    _write_sync_record(local_path, blob.generation)
+    logger.info("Downloaded %s to %s", filename, local_path)
+
+def _upload_one(bucket, filename):
+    """Upload a local data file to the bucket as data/<filename>, skipping it if it doesn't exist"""
+    local_path = os.path.join(DATA_DIR, filename)
+    
+    # Skip if file doesn't exist
+    if not os.path.exists(local_path):
+        logger.warning("%s not found. Skipping upload.", local_path)
+        return
+    
+    # Skip if the file hasn't changed since it was last synced with the bucket
+    # A fresh process has no in-memory entry yet, so fall back to the record left by the last sync
+    signature = _file_signature(local_path)
+    synced_signature = _synced_signatures.get(filename)
+    if synced_signature is None:
+        record = _read_sync_record(local_path)
+        synced_signature = record[1] if record is not None else None
+    if synced_signature == signature:
+        logger.debug("%s is unchanged. Skipping upload.", local_path)
+        return
+    
+    blob = bucket.blob(f"data/{filename}")
+    blob.upload_from_filename(local_path)
+    _write_sync_record(local_path, blob.generation)
+    logger.info("Uploaded %s to GCS as data/%s", local_path, filename)
+
+def get_bucket():
+    """
+    Return the GCS bucket, creating the storage client with default credentials on first use
+    The client is kept for the life of the process, so later calls skip the credential lookup
+    """
+    global _storage_client, _bucket
+    if _bucket is None:
+        _storage_client = storage.Client()
+        _bucket = _storage_client.bucket(GCS_BUCKET)
+    return _bucket
+
 def download_from_gcs():
     """
     Download JSON files from Google Cloud Storage using application default credentials
     """
     try:
-        print(f"Downloading files from GCS bucket: {GCS_BUCKET}")
+        logger.info("Downloading files from GCS bucket: %s", GCS_BUCKET)
         
-        # Initialize storage client with default credentials
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(GCS_BUCKET)
+        bucket = get_bucket()
         
         # Files to download
         files = ['mm.json', 'pb.json']
         
-        for filename in files:
-            local_path = os.path.join(DATA_DIR, filename)
-            blob = bucket.blob(f"data/{filename}")
-            
-            # Check if blob exists
-            if blob.exists():
-                print(f"Downloading {filename} from GCS...")
-                blob.download_to_filename(local_path)
-                print(f"Downloaded {filename} to {local_path}")
-            else:
-                print(f"File {filename} not found in GCS bucket. Will create it if needed.")
-                # Create empty file if it doesn't exist locally
-                if not os.path.exists(local_path):
-                    with open(local_path, 'w') as f:
-                        json.dump([], f)
-                    print(f"Created empty {local_path}")
+        # Each file is an independent round-trip to GCS, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=len(files)) as executor:
+            list(executor.map(lambda filename: _download_one(bucket, filename), files))
         
         return True
         
     except Exception as e:
-        print(f"Error downloading files from GCS: {e}")
+        logger.error("Error downloading files from GCS: %s", e)
         # Create empty files if download fails
         for filename in ['mm.json', 'pb.json']:
             local_path = os.path.join(DATA_DIR, filename)
             if not os.path.exists(local_path):
-                with open(local_path, 'w') as f:
-                    json.dump([], f)
-                print(f"Created empty {local_path} after GCS error")
+                save_json([], local_path)
+                logger.info("Created empty %s after GCS error", local_path)
         return False
 
 def upload_to_gcs():
@@ -65,232 +236,352 @@ def upload_to_gcs():
     Upload JSON files to Google Cloud Storage using application default credentials
     """
     try:
-        print(f"Uploading files to GCS bucket: {GCS_BUCKET}")
+        logger.info("Uploading files to GCS bucket: %s", GCS_BUCKET)
         
-        # Initialize storage client with default credentials
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(GCS_BUCKET)
+        bucket = get_bucket()
         
         # Files to upload
         files = ['mm.json', 'pb.json', 'mm-stats.json', 'pb-stats.json']
         
-        for filename in files:
-            local_path = os.path.join(DATA_DIR, filename)
-            
-            # Skip if file doesn't exist
-            if not os.path.exists(local_path):
-                print(f"Warning: {local_path} not found. Skipping upload.")
-                continue
-            
-            blob = bucket.blob(f"data/{filename}")
-            blob.upload_from_filename(local_path)
-            print(f"Uploaded {local_path} to GCS as data/{filename}")
+        # Each file is an independent round-trip to GCS, so send them concurrently
+        with ThreadPoolExecutor(max_workers=len(files)) as executor:
+            list(executor.map(lambda filename: _upload_one(bucket, filename), files))
         
         return True
         
     except Exception as e:
-        print(f"Error uploading files to GCS: {e}")
+        logger.error("Error uploading files to GCS: %s", e)
         return False
 
+def load_draws(path):
+    """
+    Load a draw file, reusing the parsed list while the file is unchanged on disk
+    The returned list is shared with the cache, so callers must not modify it
+    """
+    signature = _file_signature(path)
+    
+    cached = _draws_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    draws = load_json(path)
+    _draws_cache[path] = (signature, draws)
+    return draws
+
 def get_latest_draws():
     """
     Fetch the latest draw dates from local JSON files (data/pb.json and data/mm.json)
     Returns a dictionary with 'powerball' and 'mega-millions' dates
     """
     try:
+        pb_path = os.path.join(DATA_DIR, 'pb.json')
+        mm_path = os.path.join(DATA_DIR, 'mm.json')
+        
+        # Reuse the cached result if it is fresh and neither file has been rewritten since
+        mtimes = tuple(os.stat(path).st_mtime_ns if os.path.exists(path) else None for path in (pb_path, mm_path))
+        if (_latest_draws_cache['data'] is not None and _latest_draws_cache['mtimes'] == mtimes
+                and time.time() - _latest_draws_cache['timestamp'] < LATEST_DRAWS_TTL):
+            return dict(_latest_draws_cache['data'])
+        
         # Default values if files don't exist
         powerball_date = None
         megamillions_date = None
         
         # Try to load Powerball draws
-        pb_path = os.path.join(DATA_DIR, 'pb.json')
         if os.path.exists(pb_path):
-            with open(pb_path, 'r') as f:
-                powerball_draws = json.load(f)
-                if powerball_draws and len(powerball_draws) > 0:
-                    # Sort by date in descending order to get the latest
-                    powerball_draws.sort(key=lambda x: x.get('date', ''), reverse=True)
-                    powerball_date = powerball_draws[0].get('date')
-                    print(f"Latest Powerball draw: {powerball_draws[0]}")
+            powerball_draws = load_draws(pb_path)
+            if powerball_draws and len(powerball_draws) > 0:
+                # Single pass for the draw with the latest date
+                latest_draw = max(powerball_draws, key=lambda x: x.get('date', ''))
+                powerball_date = latest_draw.get('date')
+                logger.debug("Latest Powerball draw: %s", latest_draw)
         
         # Try to load Mega Millions draws
-        mm_path = os.path.join(DATA_DIR, 'mm.json')
         if os.path.exists(mm_path):
-            with open(mm_path, 'r') as f:
-                megamillions_draws = json.load(f)
-                if megamillions_draws and len(megamillions_draws) > 0:
-                    # Sort by date in descending order to get the latest
-                    megamillions_draws.sort(key=lambda x: x.get('date', ''), reverse=True)
-                    megamillions_date = megamillions_draws[0].get('date')
-                    print(f"Latest Mega Millions draw: {megamillions_draws[0]}")
-        
-        return {
+            megamillions_draws = load_draws(mm_path)
+            if megamillions_draws and len(megamillions_draws) > 0:
+                # Single pass for the draw with the latest date
+                latest_draw = max(megamillions_draws, key=lambda x: x.get('date', ''))
+                megamillions_date = latest_draw.get('date')
+                logger.debug("Latest Mega Millions draw: %s", latest_draw)
+        
+        latest_draws = {
             'powerball': powerball_date,
             'mega-millions': megamillions_date
         }
+        _latest_draws_cache.update(timestamp=time.time(), mtimes=mtimes, data=latest_draws)
+        
+        return dict(latest_draws)
     except Exception as e:
-        print(f"Error fetching latest draws from JSON files: {e}")
+        logger.error("Error fetching latest draws from JSON files: %s", e)
         return {'powerball': None, 'mega-millions': None}
 
-def scrape_lottery_numbers(url, game_type):
+def parse_draw_date(date_text):
     """
-    Scrape lottery numbers directly from URL
+    Convert a lottery.net draw date (format: "Wednesday March 26, 2025") to YYYY-MM-DD
+    Returns None if the text isn't a draw date
+    """
+    match = DATE_RE.search(date_text)
+    if match is None:
+        return None
+    
+    month_name, day, year = match.groups()
+    return f"{year}-{MONTHS[month_name]}-{int(day):02d}"
+
+def parse_draws_with_regex(content, game_type):
+    """
+    Extract draws from a results page (raw bytes) with a single precompiled regex pass (no DOM is built)
     game_type: 'powerball' or 'megamillions'
+    
+    Returns:
+        tuple: (draws, rejected) where rejected counts rows with a date cell that couldn't be read
     """
-    try:
-        # Get webpage content
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        # Parse the HTML content
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find all draw entries (they are in table rows)
-        draws = []
-        
-        # Find all table rows that contain draw information
-        draw_rows = soup.find_all('tr')
-        
-        for row in draw_rows:
-            try:
-                # Find the date cell
-                date_cell = row.find('td', style="text-align: center;")
-                if not date_cell:
-                    continue
-                    
-                # Extract date from the link
-                date_link = date_cell.find('a')
-                if not date_link:
-                    continue
-                    
-                date_text = date_link.text.strip()
-                # Parse the date (format: "Wednesday March 26, 2025")
-                date_parts = date_text.split()
-                if len(date_parts) < 3:
-                    continue
-                    
-                # Clean up the date string by removing extra commas
-                date_str = f"{date_parts[1]} {date_parts[2].replace(',', '')}, {date_parts[3]}"
-                date = datetime.strptime(date_str, '%B %d, %Y').strftime('%Y-%m-%d')
-                
-                # Find the numbers cell
-                numbers_cell = row.find_all('td')[1] if len(row.find_all('td')) > 1 else None
-                if not numbers_cell:
-                    continue
-                
-                # Find the first set of numbers (main draw, not double play)
-                game_class = 'powerball' if game_type == 'powerball' else 'mega-millions'
-                numbers_list = numbers_cell.find('ul', class_=f'multi results {game_class}')
-                if not numbers_list:
-                    continue
-                
-                # Extract main numbers
-                numbers = numbers_list.find_all('li', class_='ball')
-                if len(numbers) < 5:
-                    continue
-                    
-                main_numbers = [int(num.text.strip()) for num in numbers[:5]]
+    numbers_list_re, special_ball_re = GAME_PATTERNS[game_type]
+    draw_type = 'powerball' if game_type == 'powerball' else 'mega-millions'
+    draws = []
+    rejected = 0
+    
+    # Bind the per-row calls once; attribute lookups add up over a page of rows
+    find_date_link = DATE_LINK_RE.search
+    strip_tags = TAG_RE.sub
+    find_numbers_list = numbers_list_re.search
+    find_balls = BALL_RE.findall
+    find_special_ball = special_ball_re.search
+    add_draw = draws.append
+    
+    for row in ROW_RE.finditer(content):
+        row_html = row.group(1)
+        try:
+            # Find the date link in the date cell
+            date_link = find_date_link(row_html)
+            if date_link is None:
+                continue
+            
+            date = parse_draw_date(strip_tags(b' ', date_link.group(1)).decode('utf-8', 'replace'))
+            if date is None:
+                rejected += 1
+                continue
+            
+            # Find the first set of numbers (main draw, not double play)
+            numbers_list = find_numbers_list(row_html)
+            if numbers_list is None:
+                rejected += 1
+                continue
+            numbers_html = numbers_list.group(1)
+            
+            # Extract main numbers
+            numbers = find_balls(numbers_html)
+            if len(numbers) < 5:
+                rejected += 1
+                continue
+            
+            # Extract special ball number (Powerball or Mega Ball)
+            special_ball = find_special_ball(numbers_html)
+            if special_ball is None:
+                rejected += 1
+                continue
+            
+            add_draw({
+                'date': date,
+                'numbers': list(map(int, numbers[:5])),
+                'specialBall': int(special_ball.group(1)),
+                'type': draw_type
+            })
+        except Exception as e:
+            logger.debug("Error processing draw entry: %s", e)
+            rejected += 1
+            continue
+    
+    return draws, rejected
+
+def parse_draws_with_selectolax(content, game_type):
+    """
+    Extract draws from a results page by walking the parsed HTML tree
+    game_type: 'powerball' or 'megamillions'
+    """
+    # Imported here since this parser only runs when the regex pass can't read the page
+    from selectolax.lexbor import LexborHTMLParser
+    
+    # selectolax parses with the C lexbor engine and takes the raw bytes, detecting the encoding itself
+    tree = LexborHTMLParser(content)
+    
+    game_class = 'powerball' if game_type == 'powerball' else 'mega-millions'
+    numbers_list_selector, special_ball_selector = GAME_SELECTORS[game_type]
+    
+    # Find all draw entries (they are in table rows)
+    draws = []
+    
+    # Find only the table rows that have a date cell, i.e. contain draw information
+    draw_rows = tree.css(DRAW_ROW_SELECTOR)
+    
+    for row in draw_rows:
+        try:
+            # Extract date from the link in the date cell
+            date_link = row.css_first(DATE_LINK_SELECTOR)
+            if date_link is None:
+                continue
                 
-                # Extract special ball number (Powerball or Mega Ball)
-                special_ball = numbers_list.find('li', class_='powerball' if game_type == 'powerball' else 'mega-ball')
-                if not special_ball:
-                    continue
-                    
-                special_ball_number = int(special_ball.text.strip())
+            date = parse_draw_date(date_link.text(separator=' '))
+            if date is None:
+                continue
+            
+            # Find the first set of numbers (main draw, not double play) in the numbers cell
+            numbers_list = row.css_first(numbers_list_selector)
+            if numbers_list is None:
+                continue
+            
+            # Extract main numbers
+            numbers = numbers_list.css(BALL_SELECTOR)
+            if len(numbers) < 5:
+                continue
                 
-                draws.append({
-                    'date': date,
-                    'numbers': main_numbers,
-                    'specialBall': special_ball_number,
-                    'type': 'powerball' if game_type == 'powerball' else 'mega-millions'
-                })
-            except Exception as e:
-                print(f"Error processing draw entry: {e}")
+            main_numbers = [int(num.text(strip=True)) for num in numbers[:5]]
+            
+            # Extract special ball number (Powerball or Mega Ball)
+            special_ball = numbers_list.css_first(special_ball_selector)
+            if special_ball is None:
                 continue
-        
-        return draws
-        
+                
+            special_ball_number = int(special_ball.text(strip=True))
+            
+            draws.append({
+                'date': date,
+                'numbers': main_numbers,
+                'specialBall': special_ball_number,
+                'type': game_class
+            })
+        except Exception as e:
+            logger.debug("Error processing draw entry: %s", e)
+            continue
+    
+    return draws
+
+def fetch_page(url):
+    """
+    Fetch a results page through the shared pool manager and return its raw (decompressed) bytes
+    Raises urllib3.exceptions.HTTPError on connection errors or an error status
+    """
+    response = HTTP.request('GET', url)
+    if response.status >= 400:
+        raise urllib3.exceptions.HTTPError(f"HTTP {response.status} fetching {url}")
+    return response.data
+
+def parse_lottery_numbers(content, game_type):
+    """
+    Extract draws from a fetched results page
+    game_type: 'powerball' or 'megamillions'
+    """
+    # Try the fast regex pass first; fall back to the HTML parser if it can't read every draw row
+    try:
+        draws, rejected = parse_draws_with_regex(content, game_type)
+    except Exception as e:
+        logger.warning("Regex parsing of %s page failed: %s", game_type, e)
+        draws, rejected = [], 0
+    
+    if rejected:
+        logger.warning("Regex parsing skipped %d dated %s row(s); re-parsing with selectolax", rejected, game_type)
+    
+    if rejected or not draws:
+        draws = parse_draws_with_selectolax(content, game_type)
+    
+    return draws
+
+def scrape_lottery_numbers(url, game_type):
+    """
+    Scrape lottery numbers directly from URL
+    game_type: 'powerball' or 'megamillions'
+    """
+    try:
+        return parse_lottery_numbers(fetch_page(url), game_type)
     except Exception as e:
-        print(f"Error scraping {game_type} data: {e}")
+        logger.error("Error scraping %s data: %s", game_type, e)
         return None
 
 def filter_lottery_data(data, start_date):
-    """Filter lottery data from the day after start_date"""
+    """
+    Filter lottery data from the day after start_date
+    data must be newest first, which is the order lottery.net lists draws in
+    """
     try:
         if not start_date:
             # If no start_date provided, return all data
             return data
             
-        # Convert start_date string to datetime object
-        start_datetime = datetime.strptime(start_date, '%Y-%m-%d')
-        
-        # Filter draws from the day after start_date (exclusive)
-        filtered_data = [
-            draw for draw in data 
-            if datetime.strptime(draw['date'], '%Y-%m-%d') > start_datetime
-        ]
-        
-        # Sort the filtered data by date in descending order (newest first)
-        filtered_data.sort(key=lambda x: x['date'], reverse=True)
+        # Validate start_date; draw dates are YYYY-MM-DD, so plain string comparison orders them by date
+        datetime.strptime(start_date, '%Y-%m-%d')
         
-        return filtered_data
+        # Take draws from the day after start_date (exclusive), stopping at the first older one.
+        # The input is newest first, so the result already is too
+        return list(takewhile(lambda draw: draw['date'] > start_date, data))
         
     except Exception as e:
-        print(f"Error filtering lottery data: {e}")
+        logger.error("Error filtering lottery data: %s", e)
         return None
 
 def update_statistics():
     """Update statistics based on current JSON data"""
     try:
         from calculate_stats import calculate_lottery_stats
-        print("\nUpdating statistics based on new draws...")
+        logger.info("Updating statistics based on new draws...")
         calculate_lottery_stats(
             mm_input=os.path.join(DATA_DIR, "mm.json"), 
             pb_input=os.path.join(DATA_DIR, "pb.json"),
             mm_output=os.path.join(DATA_DIR, "mm-stats.json"), 
             pb_output=os.path.join(DATA_DIR, "pb-stats.json")
         )
-        print("Statistics updated successfully")
+        logger.info("Statistics updated successfully")
         return True
     except Exception as e:
-        print(f"Error updating statistics: {e}")
+        logger.error("Error updating statistics: %s", e)
         return False
 
 def save_to_json(draws, filename):
     """Save draws to a JSON file in the data directory"""
     try:
+        # Nothing to merge; leave the file untouched
+        if not draws:
+            return False
+        
         # Get full file path
         file_path = os.path.join(DATA_DIR, filename)
         
         # Track if new draws were added
         new_draws_added = False
         
-        # Load existing draws if file exists
+        # Load existing draws if file exists (copied, since the cached list is shared)
         existing_draws = []
         if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                existing_draws = json.load(f)
+            existing_draws = list(load_draws(file_path))
         
         # Add new draws to existing draws
         # Create a set of existing dates to avoid duplicates
         existing_dates = {draw.get('date') for draw in existing_draws}
         
+        new_draws = []
         for draw in draws:
             if draw.get('date') not in existing_dates:
-                existing_draws.append(draw)
+                new_draws.append(draw)
                 existing_dates.add(draw.get('date'))
                 new_draws_added = True
         
-        # Sort draws by date (newest first)
-        existing_draws.sort(key=lambda x: x.get('date', ''), reverse=True)
-        
-        # Save to file
-        with open(file_path, 'w') as f:
-            json.dump(existing_draws, f, indent=2)
+        if new_draws:
+            # Keep draws sorted by date (newest first). The file is already in that order, so
+            # draws newer than everything on disk (the usual case) just go on the front
+            new_draws.sort(key=lambda x: x.get('date', ''), reverse=True)
+            if not existing_draws or new_draws[-1].get('date', '') > existing_draws[0].get('date', ''):
+                existing_draws[:0] = new_draws
+            else:
+                existing_draws.extend(new_draws)
+                existing_draws.sort(key=lambda x: x.get('date', ''), reverse=True)
+            
+            # Save to file only when something changed
+            save_json(existing_draws, file_path, pretty=True)
+            _draws_cache[file_path] = (_file_signature(file_path), existing_draws)
+            _latest_draws_cache['data'] = None
         
         return new_draws_added
     except Exception as e:
-        print(f"Error saving to JSON: {e}")
+        logger.error("Error saving to JSON: %s", e)
         return False
 
 def scrape_lottery_data():
@@ -311,14 +602,14 @@ def scrape_lottery_data():
         # If no draws found, set default dates to start from
         if not latest_draws['powerball']:
             latest_draws['powerball'] = '2020-01-01'
-            print(f"No existing Powerball draws found. Starting from {latest_draws['powerball']}")
+            logger.info("No existing Powerball draws found. Starting from %s", latest_draws['powerball'])
             
         if not latest_draws['mega-millions']:
             latest_draws['mega-millions'] = '2020-01-01'
-            print(f"No existing Mega Millions draws found. Starting from {latest_draws['mega-millions']}")
+            logger.info("No existing Mega Millions draws found. Starting from %s", latest_draws['mega-millions'])
             
-        print(f"\nLatest Powerball draw: {latest_draws['powerball']}")
-        print(f"Latest Mega Millions draw: {latest_draws['mega-millions']}\n")
+        logger.info("Latest Powerball draw: %s", latest_draws['powerball'])
+        logger.info("Latest Mega Millions draw: %s", latest_draws['mega-millions'])
         
         # Extract year from the most recent draw date
         current_year = datetime.now().year
@@ -330,12 +621,20 @@ def scrape_lottery_data():
         # Flag to track if any new draws were added
         any_new_draws = False
         
+        # Scrape both games concurrently; each request mostly waits on the network
+        logger.info("Scraping from: %s", powerball_url)
+        logger.info("Scraping from: %s", megamillions_url)
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            powerball_future = executor.submit(scrape_lottery_numbers, powerball_url, 'powerball')
+            megamillions_future = executor.submit(scrape_lottery_numbers, megamillions_url, 'megamillions')
+            powerball_draws = powerball_future.result()
+            megamillions_draws = megamillions_future.result()
+        
         # Process Powerball draws
-        print("\nProcessing Powerball draws...")
-        print(f"Latest Powerball draw date: {latest_draws['powerball']}")
-        print(f"Scraping from: {powerball_url}")
+        logger.info("Processing Powerball draws...")
+        logger.info("Latest Powerball draw date: %s", latest_draws['powerball'])
         
-        powerball_draws = scrape_lottery_numbers(powerball_url, 'powerball')
         filtered_powerball = []
         if powerball_draws:
             # Filter draws after the latest draw date
@@ -344,17 +643,15 @@ def scrape_lottery_data():
                 # Save to JSON file
                 new_pb_draws = save_to_json(filtered_powerball, 'pb.json')
                 if new_pb_draws:
-                    print(f"Successfully added {len(filtered_powerball)} Powerball draws to data/pb.json")
+                    logger.info("Successfully added %s Powerball draws to data/pb.json", len(filtered_powerball))
                     any_new_draws = True
                 else:
-                    print("No new Powerball draws to save")
+                    logger.info("No new Powerball draws to save")
         
         # Process Mega Millions draws
-        print("\nProcessing Mega Millions draws...")
-        print(f"Latest Mega Millions draw date: {latest_draws['mega-millions']}")
-        print(f"Scraping from: {megamillions_url}")
+        logger.info("Processing Mega Millions draws...")
+        logger.info("Latest Mega Millions draw date: %s", latest_draws['mega-millions'])
         
-        megamillions_draws = scrape_lottery_numbers(megamillions_url, 'megamillions')
         filtered_megamillions = []
         if megamillions_draws:
             # Filter draws after the latest draw date
@@ -363,13 +660,16 @@ def scrape_lottery_data():
                 # Save to JSON file
                 new_mm_draws = save_to_json(filtered_megamillions, 'mm.json')
                 if new_mm_draws:
-                    print(f"Successfully added {len(filtered_megamillions)} Mega Millions draws to data/mm.json")
+                    logger.info("Successfully added %s Mega Millions draws to data/mm.json", len(filtered_megamillions))
                     any_new_draws = True
                 else:
-                    print("No new Mega Millions draws to save")
+                    logger.info("No new Mega Millions draws to save")
         
-        # Automatically update statistics if new draws were added
-        if any_new_draws:
+        # Automatically update statistics if new draws were added, or if they were never calculated
+        stats_missing = not all(
+            os.path.exists(os.path.join(DATA_DIR, filename)) for filename in ('mm-stats.json', 'pb-stats.json')
+        )
+        if any_new_draws or stats_missing:
             update_statistics()
         
         # Upload updated files to GCS
@@ -381,9 +681,11 @@ def scrape_lottery_data():
         }
         
     except Exception as e:
-        print(f"Error in scrape_lottery_data: {e}")
+        logger.error("Error in scrape_lottery_data: %s", e)
         return None
 
 if __name__ == "__main__":
+    configure_logging()
+    
     # Run the scraper (automatically updates stats if new draws are found)
     results = scrape_lottery_data()
\ No newline at end of file
@@ -1,66 +1,25 @@
-import json
-import os
-from lottery_scraper import scrape_lottery_data, get_latest_draws, download_from_gcs, upload_to_gcs
-from calculate_stats import calculate_lottery_stats
-from dotenv import load_dotenv
+import logging
+from lottery_scraper import configure_logging, scrape_lottery_data
 
-# Load environment variables
-load_dotenv()
-
-# Get bucket name from environment variable or use default
-BUCKET_NAME = os.getenv('GCS_BUCKET', 'jackpot-iq')
+logger = logging.getLogger(__name__)
 
 def main():
     """
     Main function to scrape lottery data and save to JSON files
     """
-    print("Starting lottery data scraping...")
-    
-    # Download existing data from GCS
-    print("Downloading files from GCS bucket:", BUCKET_NAME)
-    try:
-        download_from_gcs()
-    except Exception as e:
-        print("Error downloading files from GCS:", str(e))
-        # Create empty files if they don't exist
-        if not os.path.exists("data/mm.json"):
-            with open("data/mm.json", "w") as f:
-                json.dump([], f)
-        if not os.path.exists("data/pb.json"):
-            with open("data/pb.json", "w") as f:
-                json.dump([], f)
-    
-    # Get latest draws from files
-    latest_draws = get_latest_draws()
-    latest_pb_date = latest_draws['powerball']
-    latest_mm_date = latest_draws['mega-millions']
-    
-    print("\nLatest Powerball draw:", latest_pb_date)
-    print("Latest Mega Millions draw:", latest_mm_date)
-    print("\n")
-    
-    # Scrape new lottery data
-    print("Scraping new lottery data...")
-    scrape_lottery_data()
-    
-    # Calculate and save statistics
-    print("\nUpdating statistics based on new draws...")
-    mm_stats, pb_stats = calculate_lottery_stats()
+    # Scraper output goes through logging; LOG_LEVEL=WARNING quiets routine progress
+    configure_logging()
     
-    # Save stats to files
-    with open("data/mm-stats.json", "w") as f:
-        json.dump(mm_stats, f, indent=2)
-    with open("data/pb-stats.json", "w") as f:
-        json.dump(pb_stats, f, indent=2)
+    logger.info("Starting lottery data scraping...")
     
-    # Upload all files to GCS
-    print("\nUploading files to GCS bucket:", BUCKET_NAME)
-    try:
-        upload_to_gcs()
-    except Exception as e:
-        print("Error uploading files to GCS:", str(e))
+    # scrape_lottery_data downloads the existing files from GCS, saves any new draws,
+    # recalculates the statistics when draws were added and uploads everything back
+    results = scrape_lottery_data()
+    if results is None:
+        logger.error("Scrape and stats update failed")
+        return
     
-    print("Scrape and stats update completed successfully")
+    logger.info("Scrape and stats update completed successfully")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()